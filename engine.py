@@ -1,31 +1,68 @@
 # engine.py
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from index import BPlusTreeIndex  # <-- now importing the B+ tree
 from storage import AppendOnlyLog
 
 class KVEngine:
     """Coordinates the in-memory index and the append-only log."""
 
-    def __init__(self, db_path: str = "data.db") -> None:
-        """Initialize the engine and rebuild state by replaying the log."""
+    def __init__(self, db_path: str = "data.db", group_commit: bool = False) -> None:
+        """Initialize the engine and rebuild state by replaying the log.
+
+        With group_commit=True, set() only queues its log record; callers must
+        call flush() before acknowledging those writes.
+        """
         self._index = BPlusTreeIndex()
-        self._log = AppendOnlyLog(db_path)
+        self._log = AppendOnlyLog(db_path, group_commit=group_commit)
+        # One-entry memo of the last key read or written (value may be None for
+        # a miss). Every write replaces it, so it can never go stale.
+        self._last_key: Optional[str] = None
+        self._last_value: Optional[str] = None
         self._load_from_log()
 
     def _load_from_log(self) -> None:
         """Rebuild in-memory state by replaying SET records from disk.
 
-        Last-write-wins is achieved by applying entries in append order so
-        later writes overwrite earlier ones for the same key.
+        The whole replay stream is handed to the index in one bulk_load call,
+        which applies entries in append order so later writes overwrite
+        earlier ones for the same key (last-write-wins).
         """
-        for key, value in self._log.replay() or []:
-            self._index.set(key, value)
+        self._index.bulk_load(self._log.replay())
 
     def set(self, key: str, value: str) -> None:
         """Persist a key-value pair and update the in-memory state."""
         self._log.append_set(key, value)
         self._index.set(key, value)
+        self._last_key, self._last_value = key, value
+
+    def set_batch(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Persist many key-value pairs with a single durable log write, then update the in-memory state.
+
+        Pairs are applied in order, so a later pair wins over an earlier one
+        with the same key.
+        """
+        items = list(items)
+        self._log.append_batch(items)
+        for key, value in items:
+            self._index.set(key, value)
+        self._last_key = None
+
+    def flush(self) -> None:
+        """Make all queued writes durable with one O_DSYNC log write (fdatasync fallback)."""
+        self._log.flush()
+
+    def close(self) -> None:
+        """Flush queued writes and close the log file."""
+        self._log.close()
 
     def get(self, key: str) -> Optional[str]:
-        """Return the latest value for a key, or None if missing."""
-        return self._index.get(key)
+        """Return the latest value for a key, or None if missing.
+
+        Repeated reads of the same key (or a read right after its write) are
+        served from the memo without descending the B+ tree.
+        """
+        if key == self._last_key:
+            return self._last_value
+        value = self._index.get(key)
+        self._last_key, self._last_value = key, value
+        return value
@@ -21,26 +21,32 @@ Commenting approach:
 """
 
 from __future__ import annotations
+import gc
 from typing import List, Optional, Iterable, Iterator, Tuple
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
+from itertools import compress, islice
+from operator import itemgetter, ne
 
 
 # -------------------- Node classes --------------------
 class _Node:
-    """Base node: keeps sorted separator `keys` and `parent` for upward navigation."""
-    __slots__ = ("parent", "keys")
+    """Base node: keeps sorted separator `keys`.
+
+    There is no parent pointer: writes record their root→leaf path instead
+    (see `BPlusTreeIndex._find_leaf_path`), so splits never rewrite child links.
+    """
+    __slots__ = ("keys",)
+    # Class-level flag (not a slot): one attribute load instead of an isinstance call.
+    IS_LEAF = False
 
     def __init__(self) -> None:
-        self.parent: Optional[_Internal] = None
         self.keys: List[str] = []
 
-    def is_leaf(self) -> bool:
-        return isinstance(self, _Leaf)
-
 
 class _Leaf(_Node):
     """Leaf stores user data: parallel `keys` and `values`, and a `next` pointer for range scans."""
-    __slots__ = ("values", "next", "parent", "keys")
+    __slots__ = ("values", "next")
+    IS_LEAF = True
 
     def __init__(self) -> None:
         super().__init__()
@@ -50,7 +56,7 @@ class _Leaf(_Node):
 
 class _Internal(_Node):
     """Internal node routes lookups: len(children) == len(keys) + 1."""
-    __slots__ = ("children", "parent", "keys")
+    __slots__ = ("children",)
 
     def __init__(self) -> None:
         super().__init__()
@@ -65,13 +71,14 @@ class BPlusTreeIndex:
       - Internal nodes: sorted keys; len(children) == len(keys) + 1
       - Leaves: `keys` and `values` are sorted-aligned; leaves linked via .next
       - Root is a _Leaf when empty; becomes _Internal once the first split occurs
+      - Nodes hold no parent pointers; `set` carries the descent path to splits
 
     Complexity (typical):
       - set/get: O(log_f N) node hops + O(ORDER) in-node list ops
     """
 
-    # Set True during testing to assert invariants after each write
-    _ENABLE_VALIDATE_AFTER_WRITE = False
+    # Smallest number of pairs bulk_load reads and merges at a time.
+    BULK_CHUNK: int = 1 << 16
 
     def __init__(self, order: int = 16) -> None:
         assert order >= 4, "order must be >= 4"
@@ -86,8 +93,9 @@ class BPlusTreeIndex:
     # -------------------- Public API --------------------
     def set(self, key: str, value: str) -> None:
         """Insert or overwrite key’s value (last-write-wins)."""
-        # 1) Find the target leaf that *would* contain `key` if present.
-        leaf = self._find_leaf(key)
+        # 1) Find the target leaf that *would* contain `key` if present, remembering
+        #    the (ancestor, child index) path in case a split has to bubble up.
+        leaf, path = self._find_leaf_path(key)
 
         # 2) Locate insertion/overwrite point inside the leaf using binary search.
         i = bisect_left(leaf.keys, key)
@@ -95,8 +103,6 @@ class BPlusTreeIndex:
         # 3) Overwrite in-place if key already exists (no structure change).
         if i < len(leaf.keys) and leaf.keys[i] == key:
             leaf.values[i] = value
-            if self._ENABLE_VALIDATE_AFTER_WRITE:
-                self._validate()
             return
 
         # 4) Insert new key/value at position i, preserving sorted order.
@@ -106,10 +112,7 @@ class BPlusTreeIndex:
 
         # 5) If we overflow capacity, split the leaf and propagate separator up.
         if len(leaf.keys) > self.MAX_KEYS:
-            self._split_leaf(leaf)
-
-        if self._ENABLE_VALIDATE_AFTER_WRITE:
-            self._validate()
+            self._split_leaf(leaf, path)
 
     def get(self, key: str) -> Optional[str]:
         """Return latest value for key, or None if missing."""
@@ -136,8 +139,7 @@ class BPlusTreeIndex:
         """Yield (key, value) in ascending key order (via leaf linked list)."""
         node = self._leftmost_leaf()
         while node is not None:
-            for k, v in zip(node.keys, node.values):
-                yield k, v
+            yield from zip(node.keys, node.values)
             node = node.next
 
     def keys(self) -> Iterator[str]:
@@ -150,18 +152,18 @@ class BPlusTreeIndex:
 
     def iter_range(self, start: str, end: Optional[str] = None) -> Iterator[Tuple[str, str]]:
         """Yield (k, v) for start ≤ k < end (if end is given)."""
-        # Start from the leaf that would contain `start`, then sweep right via .next.
-        leaf = self._find_leaf(start)
-        i = bisect_left(leaf.keys, start)
-        node, idx = leaf, i
-        while node:
-            while idx < len(node.keys):
-                k = node.keys[idx]
-                if end is not None and k >= end:
-                    return
-                yield k, node.values[idx]
-                idx += 1
-            node, idx = node.next, 0
+        # Start from the leaf that would contain `start`, then sweep right via .next,
+        # handing out whole leaf slices; only the leaf holding `end` needs a bisect.
+        node: Optional[_Leaf] = self._find_leaf(start)
+        lo = bisect_left(node.keys, start)
+        while node is not None:
+            keys = node.keys
+            if end is not None and keys and keys[-1] >= end:
+                hi = bisect_left(keys, end, lo)
+                yield from zip(keys[lo:hi], node.values[lo:hi])
+                return
+            yield from zip(keys[lo:], node.values[lo:])
+            node, lo = node.next, 0
 
     def iter_prefix(self, prefix: str) -> Iterator[Tuple[str, str]]:
         """Yield (k, v) for keys starting with `prefix` (string domain)."""
@@ -172,9 +174,54 @@ class BPlusTreeIndex:
         yield from self.iter_range(prefix, hi)
 
     def bulk_load(self, items: Iterable[Tuple[str, str]]) -> None:
-        """Naive bulk load (O(N log N)): sequential inserts; input need not be sorted."""
-        for k, v in items:
-            self.set(k, v)
+        """Load many (key, value) pairs; later duplicates win (last-write-wins).
+
+        On an empty tree the input is consumed in chunks: each chunk is merged
+        into a sorted run of unique keys, then the tree is built bottom-up from
+        that run (no per-key descents or splits). Peak memory follows the number
+        of unique keys plus one chunk, not the length of the input (a replayed
+        log may hold many writes per key). A non-empty tree falls back to
+        sequential `set` calls. Input need not be sorted.
+        """
+        if self._size:
+            for k, v in items:
+                self.set(k, v)
+            return
+
+        # The load allocates millions of tuples, lists and nodes in one burst,
+        # which would otherwise trigger repeated cyclic-GC passes over them.
+        # Nodes hold no back-pointers, so nothing built here can form a cycle.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            first = itemgetter(0)
+            run: List[Tuple[str, str]] = []  # sorted, one (latest) pair per key
+            it = iter(items)
+            while True:
+                # Chunks grow with the run (never below BULK_CHUNK), so merging
+                # stays linear overall while memory stays O(unique keys).
+                chunk = list(islice(it, max(self.BULK_CHUNK, len(run))))
+                if not chunk:
+                    break
+                # The stable sort merges the chunk into the run (timsort sees
+                # the run as one presorted stretch) and keeps older pairs before
+                # newer ones among equal keys, so the last of each group wins.
+                run += chunk
+                del chunk
+                run.sort(key=first)
+                run_keys = list(map(first, run))
+                keep = list(map(ne, run_keys, islice(run_keys, 1, None)))
+                keep.append(True)
+                del run_keys
+                run = list(compress(run, keep))
+            keys = list(map(first, run))
+            values = list(map(itemgetter(1), run))
+            del run
+            if keys:
+                self._build_from_sorted(keys, values)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
     def stats(self) -> dict:
         """Return simple stats (height, node counts, avg leaf fill)."""
@@ -193,35 +240,92 @@ class BPlusTreeIndex:
     def _leftmost_leaf(self) -> _Leaf:
         """Follow child[0] until a leaf is reached (used for full scans)."""
         node = self._root
-        while not node.is_leaf():
-            node = _as_internal(node).children[0]
+        while not node.IS_LEAF:
+            node = node.children[0]  # type: ignore[attr-defined]
         return node  # type: ignore[return-value]
 
     def _find_leaf(self, key: str) -> _Leaf:
         """Descend root→leaf using binary searches in internal nodes.
 
-        We use bisect_left so equal separators route to the *left* child. This is
-        the standard choice that also aligns with overwrite semantics.
+        We use bisect_right so a key equal to a separator routes to the *right*
+        child: separators are copies of the right sibling's first key (see
+        `_split_leaf`), so that is where the key lives.
         """
         node = self._root
-        while not node.is_leaf():
-            internal = _as_internal(node)
+        # Local alias: this loop runs once per tree level on every get/set.
+        br = bisect_right
+        while not node.IS_LEAF:
             # Example: keys = [k0, k1, k2]; children = [c0, c1, c2, c3]
-            # i = first index where keys[i] >= key
+            # i = first index where keys[i] > key
             #   key < k0  -> i=0 -> c0
             #   k0<=key<k1-> i=1 -> c1
             #   k1<=key<k2-> i=2 -> c2
             #   key >= k2 -> i=3 -> c3
-            i = bisect_left(internal.keys, key)
-            node = internal.children[i]
+            node = node.children[br(node.keys, key)]  # type: ignore[attr-defined]
         return node  # type: ignore[return-value]
 
-    def _split_leaf(self, leaf: _Leaf) -> None:
+    def _build_from_sorted(self, keys: List[str], values: List[str]) -> None:
+        """Replace the tree with one built bottom-up from unique, ascending keys.
+
+        Level by level (n=7, MAX_KEYS=3, ORDER=4):
+
+            leaves:    [k0 k1 k2] -> [k3 k4] -> [k5 k6]     (even split, chained)
+            separators:            k3          k5         (min key of each child but the first)
+            root:      keys=[k3, k5], children=[L0, L1, L2]
+
+        Chunks are spread evenly so every node is at least half full and every
+        internal node has >= 2 children.
+        """
+        prev: Optional[_Leaf] = None
+        level: List[_Node] = []
+        for lo, hi in _even_chunks(len(keys), self.MAX_KEYS):
+            leaf = _Leaf()
+            leaf.keys = keys[lo:hi]
+            leaf.values = values[lo:hi]
+            if prev is not None:
+                prev.next = leaf
+            level.append(leaf)
+            prev = leaf
+
+        # mins[i] = smallest key under level[i]; it becomes that child's separator.
+        mins = [leaf.keys[0] for leaf in level]
+        while len(level) > 1:
+            parents: List[_Node] = []
+            parent_mins: List[str] = []
+            for lo, hi in _even_chunks(len(level), self.ORDER):
+                node = _Internal()
+                node.children = level[lo:hi]
+                node.keys = mins[lo + 1 : hi]
+                parents.append(node)
+                parent_mins.append(mins[lo])
+            level, mins = parents, parent_mins
+
+        self._root = level[0]
+        self._size = len(keys)
+
+    def _find_leaf_path(self, key: str) -> Tuple[_Leaf, List[Tuple[_Internal, int]]]:
+        """Like `_find_leaf`, but also return the descent path for writes.
+
+        path[i] = (ancestor, index of the child we descended into), root first.
+        Splits pop entries off the end to reach each parent and the split child's
+        slot in it, replacing parent pointers and child-identity scans.
+        """
+        node = self._root
+        path: List[Tuple[_Internal, int]] = []
+        br = bisect_right
+        while not node.IS_LEAF:
+            i = br(node.keys, key)  # type: ignore[attr-defined]
+            path.append((node, i))  # type: ignore[arg-type]
+            node = node.children[i]  # type: ignore[attr-defined]
+        return node, path  # type: ignore[return-value]
+
+    def _split_leaf(self, leaf: _Leaf, path: List[Tuple[_Internal, int]]) -> None:
         """Split a full leaf into (leaf, new_leaf) and push the first key of new_leaf up.
 
         Why the first key of the right sibling?
           In a B+ tree, internal separators are *routing keys*, not stored values.
-          Choosing new_leaf.keys[0] ensures all keys left <= sep < all keys right.
+          Choosing new_leaf.keys[0] ensures all keys left < sep <= all keys right,
+          which is why `_find_leaf` must route with bisect_right.
 
         Diagram (K=keys, V=values; '|' indicates split):
 
@@ -240,9 +344,9 @@ class BPlusTreeIndex:
         new_leaf.keys = leaf.keys[mid:]
         new_leaf.values = leaf.values[mid:]
 
-        # Truncate left to lower half.
-        leaf.keys = leaf.keys[:mid]
-        leaf.values = leaf.values[:mid]
+        # Truncate left to lower half in place (no second copy of the lower half).
+        del leaf.keys[mid:]
+        del leaf.values[mid:]
 
         # Maintain leaf chain for range scans.
         new_leaf.next = leaf.next
@@ -251,40 +355,43 @@ class BPlusTreeIndex:
         # Separator pushed to parent = first key in the right sibling.
         sep_key = new_leaf.keys[0]
 
-        parent = leaf.parent
-        if parent is None:
-            # Height increases: build a fresh root separating left and right.
-            new_root = _Internal()
-            new_root.keys = [sep_key]
-            new_root.children = [leaf, new_leaf]
-            leaf.parent = new_root
-            new_leaf.parent = new_root
-            self._root = new_root
-            return
-
-        # Insert (sep_key, new_leaf) immediately to the right of `leaf` in `parent`.
-        self._insert_into_parent(parent, leaf, sep_key, new_leaf)
+        # Insert (sep_key, new_leaf) immediately to the right of `leaf` in its parent.
+        self._insert_into_parent(path, leaf, sep_key, new_leaf)
 
-    def _insert_into_parent(self, parent: _Internal, left: _Node, key: str, right: _Node) -> None:
-        """Insert a separator `key` and right-child `right` to the right of `left` in `parent`.
+    def _insert_into_parent(
+        self, path: List[Tuple[_Internal, int]], left: _Node, key: str, right: _Node
+    ) -> None:
+        """Hook a split (`left`, `key`, `right`) into its parent, bubbling splits upward.
 
         Parent layout before (keys shown between children):
             [ c0  k0  c1  k1  c2  k2  c3 ]
 
-        If `left` is c1 and key is k1', we insert at position of c1:
+        If the split child is c1 (pos=1) and key is k1', we insert at pos:
             keys.insert(pos, k1') and children.insert(pos+1, right)
-        """
-        pos = self._find_child_index(parent, left)
-        parent.keys.insert(pos, key)
-        parent.children.insert(pos + 1, right)
-        right.parent = parent
-
-        # If parent overflows, split and bubble one key up.
-        if len(parent.keys) > self.MAX_KEYS:
-            self._split_internal(parent)
 
-    def _split_internal(self, internal: _Internal) -> None:
-        """Split a full internal node and promote the middle key to the parent.
+        `pos` comes from the descent path, so no child scan is needed. Splits
+        keep the left half in the original node, so `left` is already in place.
+        An overflowing parent is split in turn and the loop moves one level up
+        (iterative, so a cascade costs no extra Python frames); running out of
+        ancestors means the root split and the tree grows by one level.
+        """
+        while path:
+            parent, pos = path.pop()
+            parent.keys.insert(pos, key)
+            parent.children.insert(pos + 1, right)
+            if len(parent.keys) <= self.MAX_KEYS:
+                return
+            key, right = self._split_internal(parent)
+            left = parent
+
+        # Height increases: build a fresh root separating left and right.
+        new_root = _Internal()
+        new_root.keys = [key]
+        new_root.children = [left, right]
+        self._root = new_root
+
+    def _split_internal(self, internal: _Internal) -> Tuple[str, _Internal]:
+        """Split a full internal node in place; return (promote, right) for the caller to hook up.
 
         Internal split differs from leaf split: the middle key is *promoted*
         (removed from both children), preserving routing correctness.
@@ -293,125 +400,84 @@ class BPlusTreeIndex:
             keys:   [k0, k1, k2, k3, k4]   (mid=2, promote=k2)
             child:  [c0, c1, c2, c3, c4, c5]
 
-        after:
-            left.keys   = [k0, k1]
-            left.child  = [c0, c1, c2]
-            promote     =  k2   (goes to parent; not kept in children)
-            right.keys  = [k3, k4]
-            right.child = [c3, c4, c5]
+        after (`internal` keeps the left half, so its parent slot stays valid):
+            internal.keys  = [k0, k1]
+            internal.child = [c0, c1, c2]
+            promote        =  k2   (goes to parent; not kept in children)
+            right.keys     = [k3, k4]
+            right.child    = [c3, c4, c5]
         """
         mid = len(internal.keys) // 2
         promote = internal.keys[mid]
 
-        left = _Internal()
-        left.keys = internal.keys[:mid]
-        left.children = internal.children[: mid + 1]
-        for ch in left.children:
-            ch.parent = left
-
         right = _Internal()
         right.keys = internal.keys[mid + 1 :]
         right.children = internal.children[mid + 1 :]
-        for ch in right.children:
-            ch.parent = right
-
-        parent = internal.parent
-        if parent is None:
-            # Height increases: new root separates left/right by `promote`.
-            new_root = _Internal()
-            new_root.keys = [promote]
-            new_root.children = [left, right]
-            left.parent = new_root
-            right.parent = new_root
-            self._root = new_root
-            return
 
-        # Replace old `internal` with `left` in parent, then insert (promote, right).
-        pos = self._replace_child(parent, internal, left)
-        parent.keys.insert(pos, promote)
-        parent.children.insert(pos + 1, right)
-        right.parent = parent
-
-        if len(parent.keys) > self.MAX_KEYS:
-            self._split_internal(parent)
+        del internal.keys[mid:]
+        del internal.children[mid + 1 :]
+        return promote, right
 
     # -------------------- Validation & Stats (debug helpers) --------------------
     def _validate(self) -> None:
         """Validate B+ tree invariants; raise AssertionError if violated.
 
+        Walks the tree level by level (no recursion), carrying each node's
+        routing bounds down from its parent.
+
         Checks:
-          - Keys are sorted at every node.
-          - Internal: len(children) == len(keys) + 1 and parent links consistent.
-          - Separator keys sit between child key ranges (routing correctness).
-          - Leaf chain is non-decreasing across `.next`.
+          - Internal: sorted keys and len(children) == len(keys) + 1.
+          - All leaves sit at the same depth (the tree is balanced).
+          - Routing: every key under children[i] lies in [keys[i-1], keys[i]).
+          - Leaf chain: `.next` links the leaves left to right, and their keys
+            are strictly increasing (sorted, no duplicates).
         """
-        def dfs(node: _Node) -> List[str]:
-            if node.is_leaf():
-                leaf: _Leaf = node  # type: ignore
-                assert leaf.keys == sorted(leaf.keys)
-                assert len(leaf.keys) == len(leaf.values)
-                # Return [min_key, max_key] range for routing checks upstream.
-                return [leaf.keys[0], leaf.keys[-1]] if leaf.keys else []
-            internal: _Internal = node  # type: ignore
-            assert len(internal.children) == len(internal.keys) + 1
-            assert internal.keys == sorted(internal.keys)
-            ranges = []
-            for ch in internal.children:
-                assert ch.parent is internal
-                rng = dfs(ch)
-                if rng:
-                    ranges.append(rng)
-            # Check that each separator `keys[i]` lies between child ranges i and i+1.
-            for i, k in enumerate(internal.keys):
-                left_max = ranges[i][1] if ranges[i] else None
-                right_min = ranges[i + 1][0] if ranges[i + 1] else None
-                if left_max is not None:
-                    assert left_max <= k
-                if right_min is not None:
-                    assert k <= right_min
-            return [ranges[0][0], ranges[-1][1]] if ranges else []
-
-        dfs(self._root)
-
-        # Verify leaf chain ordering via `.next` pointers.
-        if isinstance(self._root, _Internal):
-            n: _Node = self._root
-            while not n.is_leaf():
-                n = _as_internal(n).children[0]
-            seen: List[str] = []
-            while n is not None:
-                leaf: _Leaf = n  # type: ignore
-                seen.extend(leaf.keys)
-                if leaf.next is not None:
-                    assert (not leaf.keys) or leaf.keys[-1] <= leaf.next.keys[0]
-                n = leaf.next
-            assert seen == sorted(seen)
+        # (node, lo, hi): every key below `node` must satisfy lo <= key < hi (None = open).
+        level: List[Tuple[_Node, Optional[str], Optional[str]]] = [(self._root, None, None)]
+        while not level[0][0].IS_LEAF:
+            below: List[Tuple[_Node, Optional[str], Optional[str]]] = []
+            for node, lo, hi in level:
+                assert not node.IS_LEAF, "leaves at different depths"
+                internal: _Internal = node  # type: ignore
+                assert len(internal.children) == len(internal.keys) + 1
+                assert internal.keys == sorted(internal.keys)
+                # Child i is bounded by the separators on either side of it.
+                bounds: List[Optional[str]] = [lo, *internal.keys, hi]
+                for i, ch in enumerate(internal.children):
+                    below.append((ch, bounds[i], bounds[i + 1]))
+            level = below
+
+        leaves: List[_Leaf] = []
+        for node, lo, hi in level:
+            assert node.IS_LEAF, "leaves at different depths"
+            leaf: _Leaf = node  # type: ignore
+            assert len(leaf.keys) == len(leaf.values)
+            if leaf.keys:
+                assert lo is None or lo <= leaf.keys[0]
+                assert hi is None or leaf.keys[-1] < hi
+            leaves.append(leaf)
+
+        # Verify the `.next` chain follows the tree's leaf order, in key order.
+        for leaf, nxt in zip(leaves, leaves[1:] + [None]):
+            assert leaf.next is nxt
+        seen = [k for leaf in leaves for k in leaf.keys]
+        assert all(a < b for a, b in zip(seen, seen[1:]))
 
     def _collect_stats(self) -> Tuple[int, int, int, int]:
-        """Return (height, internal_nodes, leaf_nodes, total_leaf_keys)."""
-        if isinstance(self._root, _Leaf):
-            return (1, 0, 1, len(self._root.keys))
-        # Height = edges along the left spine + 1
-        h = 1
-        n: _Node = self._root
-        while not n.is_leaf():
-            h += 1
-            n = _as_internal(n).children[0]
-        # Count nodes with a stack (order doesn't matter)
+        """Return (height, internal_nodes, leaf_nodes, total_leaf_keys).
+
+        The tree is balanced, so one level-by-level sweep counts every node and
+        ends on the leaf level.
+        """
+        level: List[_Node] = [self._root]
+        height = 1
         internal_cnt = 0
-        leaf_cnt = 0
-        total_leaf_keys = 0
-        q: List[_Node] = [self._root]
-        while q:
-            cur = q.pop()
-            if cur.is_leaf():
-                leaf_cnt += 1
-                leaf: _Leaf = cur  # type: ignore
-                total_leaf_keys += len(leaf.keys)
-            else:
-                internal_cnt += 1
-                q.extend(_as_internal(cur).children)
-        return (h, internal_cnt, leaf_cnt, total_leaf_keys)
+        while not level[0].IS_LEAF:
+            internal_cnt += len(level)
+            level = [ch for node in level for ch in node.children]  # type: ignore[attr-defined]
+            height += 1
+        total_leaf_keys = sum(len(leaf.keys) for leaf in level)
+        return (height, internal_cnt, len(level), total_leaf_keys)
 
     # -------------------- Small utilities --------------------
     @staticmethod
@@ -423,27 +489,33 @@ class BPlusTreeIndex:
         """
         return prefix + "\uffff"
 
-    @staticmethod
-    def _find_child_index(parent: _Internal, child: _Node) -> int:
-        """Return index i such that parent.children[i] is `child` (identity match)."""
-        for i, ch in enumerate(parent.children):
-            if ch is child:
-                return i
-        raise RuntimeError("child not found in parent")
 
-    @staticmethod
-    def _replace_child(parent: _Internal, old: _Node, new: _Node) -> int:
-        """Replace `old` by `new` in `parent.children`; return index where replaced."""
-        for i, ch in enumerate(parent.children):
-            if ch is old:
-                parent.children[i] = new
-                new.parent = parent
-                return i
-        raise RuntimeError("old child not found in parent")
-
-
-# -------------------- Tiny helper for clean casts --------------------
-def _as_internal(n: _Node) -> _Internal:
-    """Assert/cast `_Node` to `_Internal` (internal use only)."""
-    assert isinstance(n, _Internal), "expected _Internal"
-    return n  # type: ignore[return-value]
+class _DebugBPlusTreeIndex(BPlusTreeIndex):
+    """Testing variant that asserts tree invariants after every write.
+
+    Kept out of `BPlusTreeIndex` so the production write path carries no
+    validation flag check at all.
+    """
+
+    def set(self, key: str, value: str) -> None:
+        super().set(key, value)
+        self._validate()
+
+    def bulk_load(self, items: Iterable[Tuple[str, str]]) -> None:
+        super().bulk_load(items)
+        self._validate()
+
+
+# -------------------- Tiny helper for bulk building --------------------
+def _even_chunks(n: int, cap: int) -> Iterator[Tuple[int, int]]:
+    """Yield (lo, hi) slices covering range(n) with the fewest chunks of size <= cap.
+
+    Sizes differ by at most one, e.g. n=17, cap=15 -> (0, 9), (9, 17).
+    """
+    count = -(-n // cap)
+    base, extra = divmod(n, count)
+    lo = 0
+    for i in range(count):
+        hi = lo + base + (1 if i < extra else 0)
+        yield lo, hi
+        lo = hi
@@ -3,7 +3,7 @@
 
 import sys
 import shlex
-from typing import List, Callable, Dict, Optional
+from typing import List, Callable, Dict, Iterator, Optional
 from engine import KVEngine
 
 # -------------------- Command & message constants --------------------
@@ -22,13 +22,48 @@ ERR_INTERNAL         = "ERR internal"
 # No prompt—Gradebot pipes input
 PROMPT = ""
 
+# Characters that make shlex do more than split on single spaces (quoting,
+# escapes, or non-space whitespace); lines without them take the fast path.
+_SHLEX_CHARS = frozenset("\"'\\\t\r\n\x0b\x0c")
+
+# STDIN is read in blocks of up to this many bytes (see _input_lines).
+_READ_SIZE = 1 << 16
+
+
+# Replies queued by _print; written out in one go by _flush_output().
+_OUT: List[str] = []
+
 
 def _print(line: str) -> None:
-    """Write a single line to STDOUT and flush."""
-    sys.stdout.write(line + "\n")
+    """Queue a single line for STDOUT (sent on the next _flush_output)."""
+    _OUT.append(line)
+
+
+def _flush_output() -> None:
+    """Write all queued replies to STDOUT with a single write and flush."""
+    if _OUT:
+        sys.stdout.write("\n".join(_OUT) + "\n")
+        _OUT.clear()
     sys.stdout.flush()
 
 
+def _commit_and_flush(kv: KVEngine) -> None:
+    """Make queued SETs durable (one O_DSYNC write), then send the queued replies.
+
+    Group commit: an OK is only written after its record is on disk. If the
+    log cannot be synced, the queued replies (which may acknowledge lost
+    writes) are dropped in favour of a single error and the OSError propagates.
+    """
+    try:
+        kv.flush()
+    except OSError:
+        _OUT.clear()
+        _print(ERR_INTERNAL)
+        _flush_output()
+        raise
+    _flush_output()
+
+
 # -------------------- Command handlers --------------------
 def handle_set(args: List[str], kv: KVEngine) -> None:
     """SET <key> <value...>  ->  OK"""
@@ -70,9 +105,17 @@ DISPATCH: Dict[str, Callable[[List[str], KVEngine], Optional[str]]] = {
 def _parse_command(line: str) -> Optional[List[str]]:
     """Split a raw input line into tokens (cmd + args) using shell-like rules.
 
+    Plain lines (no quotes, escapes or tabs) are split on spaces directly,
+    which yields the same tokens as shlex without running its tokenizer.
+
     Returns:
         tokens list on success, or None if parsing fails (e.g., unbalanced quotes).
     """
+    if _SHLEX_CHARS.isdisjoint(line):
+        tokens = line.split(" ")
+        if "" in tokens:  # runs of spaces
+            tokens = [t for t in tokens if t]
+        return tokens
     try:
         return shlex.split(line)
     except ValueError:
@@ -86,42 +129,85 @@ def main(argv: List[str]) -> int:
         argv: Command-line arguments; argv[1] may optionally be a custom db path.
     """
     db_path = "data.db" if len(argv) < 2 else argv[1]
-    kv = KVEngine(db_path=db_path)
+    kv = KVEngine(db_path=db_path, group_commit=True)
 
-    while True:
+    try:
+        return _repl(kv)
+    except OSError:
+        # The log could not be synced; continuing could acknowledge lost writes.
+        return 1
+    finally:
         try:
-            raw = sys.stdin.readline()
-            if not raw:  # EOF → clean exit
-                return 0
-            line = raw.strip()
-            if not line:
-                continue
-
-            tokens = _parse_command(line)
-            if tokens is None or not tokens:
-                _print(ERR_SYNTAX)
-                continue
-
-            cmd = tokens[0].upper()
-            args = tokens[1:]
-            handler = DISPATCH.get(cmd)
-            if handler is None:
-                _print(ERR_UNKNOWN_CMD)
-                continue
-
-            result = handler(args, kv)
-            if result == "EXIT":
-                return 0
-
-        except KeyboardInterrupt:
-            return 0
-        except Exception:
-            # Don’t leak tracebacks to STDOUT—keep Gradebot clean.
-            _print(ERR_INTERNAL)
-            # Continue loop; next lines can still be processed
-
-    # Unreachable
-    # return 0
+            _commit_and_flush(kv)
+        finally:
+            kv.close()
+
+
+def _input_lines(kv: KVEngine) -> Iterator[bytes]:
+    """Yield raw input lines (without the newline) read from STDIN in large blocks.
+
+    Lines end at LF only, as with the text-mode STDIN on POSIX; a CR is left in
+    the line (the REPL's strip() removes the one from a CRLF).
+
+    Queued writes are committed and replies flushed right before each block
+    read: that is the only place we can block waiting on the client, so a
+    pipelined client shares one durable log write per block while an
+    interactive one still gets every (durable) reply first.
+    """
+    stdin = sys.stdin.buffer
+    # Pieces of the current unterminated line; joined once its newline arrives,
+    # so a very long line is not re-copied and re-scanned on every read.
+    partial: List[bytes] = []
+    while True:
+        _commit_and_flush(kv)
+        chunk = stdin.read1(_READ_SIZE)
+        if not chunk:  # EOF; a final unterminated line is still a command
+            if partial:
+                yield b"".join(partial)
+            return
+        nl = chunk.rfind(b"\n")
+        if nl < 0:
+            partial.append(chunk)
+            continue
+        partial.append(chunk[:nl])
+        yield from b"".join(partial).split(b"\n")
+        partial = [chunk[nl + 1:]] if nl + 1 < len(chunk) else []
+
+
+def _repl(kv: KVEngine) -> int:
+    """Process commands until EOF or EXIT."""
+    encoding = sys.stdin.encoding or "utf-8"
+    errors = sys.stdin.errors or "strict"  # e.g. surrogateescape in UTF-8 mode
+    try:
+        for raw in _input_lines(kv):
+            try:
+                line = raw.decode(encoding, errors).strip()
+                if not line:
+                    continue
+
+                tokens = _parse_command(line)
+                if tokens is None or not tokens:
+                    _print(ERR_SYNTAX)
+                    continue
+
+                cmd = tokens[0].upper()
+                args = tokens[1:]
+                handler = DISPATCH.get(cmd)
+                if handler is None:
+                    _print(ERR_UNKNOWN_CMD)
+                    continue
+
+                result = handler(args, kv)
+                if result == "EXIT":
+                    return 0
+
+            except Exception:
+                # Don’t leak tracebacks to STDOUT—keep Gradebot clean.
+                _print(ERR_INTERNAL)
+                # Continue loop; next lines can still be processed
+    except KeyboardInterrupt:
+        return 0
+    return 0  # EOF → clean exit
 
 
 if __name__ == "__main__":
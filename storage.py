@@ -14,7 +14,13 @@ Error policy (default, non-strict):
   - Trailing unterminated line (no newline at EOF): WARNING and ignored.
 
 Durability:
-  - Each append does: write → flush → fsync(file).
+  - Each append does a single write(2) on a descriptor opened with O_DSYNC, which
+    returns only once the data (and the size metadata needed to read it back)
+    is on disk. Platforms without O_DSYNC fall back to write → fdatasync(file)
+    (fsync where fdatasync is unavailable).
+  - With group_commit=True, appends are queued in memory and flush() writes the
+    whole queue with that single O_DSYNC write (or write + fdatasync fallback);
+    callers must not acknowledge a queued record until flush() has returned.
   - On first construction we ensure the parent directory exists; we also try
     to fsync the directory once (best-effort) so file creation survives crash.
 
@@ -23,12 +29,12 @@ This module writes logs to STDERR only (never STDOUT) to keep Gradebot happy.
 
 from __future__ import annotations
 
-import io
 import os
-import re
+import mmap
 import sys
 import logging
-from typing import Iterator, Tuple, Optional
+import warnings
+from typing import Iterable, Iterator, List, Tuple, Optional
 
 # --------------------------- Logging ---------------------------
 _logger = logging.getLogger("kvstore.storage")
@@ -40,12 +46,33 @@ _logger.setLevel(os.getenv("KV_LOG_LEVEL", "WARNING").upper())
 
 # --------------------------- Defaults --------------------------
 _DEFAULT_ENCODING = "utf-8"
-_KEY_RE = re.compile(r"^\S+$")  # no whitespace
+# O_DSYNC folds the data sync into write(2); 0 where unsupported (then we _sync).
+_O_DSYNC = getattr(os, "O_DSYNC", 0)
+# fdatasync skips flushing metadata a reader doesn't need (e.g. mtime); the
+# size change of an append is still made durable. Not available everywhere.
+_sync = getattr(os, "fdatasync", os.fsync)
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_DSYNC | getattr(os, "O_BINARY", 0)
+# Replay decodes the mapped log in newline-aligned blocks of about this size.
+_REPLAY_BLOCK = 1 << 20
+# Write buffer for compact(), so the rewrite reaches the OS in ~1 MiB writes.
+_COMPACT_BUFFER = 1 << 20
+
+
+def _valid_key(key: str) -> bool:
+    """True if key is non-empty and contains no whitespace."""
+    # isalnum() settles the common plain keys; otherwise str.split() (same
+    # whitespace set as the regex \s) must leave the key in one piece.
+    return key.isalnum() or key.split() == [key]
+
 
 class AppendOnlyLog:
     """Append-only log for SET operations.
 
-    Each successful append is immediately fsync'ed for crash safety.
+    Each successful append is immediately made durable (O_DSYNC write) for
+    crash safety, unless group commit is enabled (then durability is reached
+    at the next flush()).
+    The file is opened for appending on the first write and kept open until
+    close(); the log can also be used as a context manager.
 
     Parameters
     ----------
@@ -60,6 +87,10 @@ class AppendOnlyLog:
         they are skipped with DEBUG logs.
     encoding : str
         Text encoding for the file. Default: "utf-8".
+    group_commit : bool
+        If True, append_set only queues the record; flush() later persists all
+        queued records with a single O_DSYNC write (write + fdatasync where
+        O_DSYNC is missing). Default False (durable write per append).
     """
 
     def __init__(
@@ -70,12 +101,20 @@ class AppendOnlyLog:
         max_value_len: Optional[int] = None,
         strict: bool = False,
         encoding: str = _DEFAULT_ENCODING,
+        group_commit: bool = False,
     ) -> None:
         self.path = path
         self.max_key_len = max_key_len
         self.max_value_len = max_value_len
         self.strict = strict
         self.encoding = encoding
+        self.group_commit = group_commit
+        # Encoded records accepted but not yet written (see flush()).
+        self._pending: List[bytes] = []
+        # Append descriptor, opened by the first flush() and kept until close().
+        # Opening lazily lets a read-only log still be replayed.
+        self._fd: Optional[int] = None
+        self._closed = False
 
         # Ensure directory exists and best-effort directory fsync
         parent = os.path.dirname(path) or "."
@@ -95,9 +134,23 @@ class AppendOnlyLog:
         return (
             f"AppendOnlyLog(path={self.path!r}, max_key_len={self.max_key_len}, "
             f"max_value_len={self.max_value_len}, strict={self.strict}, "
-            f"encoding={self.encoding!r})"
+            f"encoding={self.encoding!r}, group_commit={self.group_commit})"
         )
 
+    def __enter__(self) -> "AppendOnlyLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # Last resort for a log that was never closed: release the descriptor.
+        # Queued records are dropped, not flushed; they were never acknowledged.
+        fd = getattr(self, "_fd", None)
+        if fd is not None:
+            warnings.warn(f"unclosed {self!r}", ResourceWarning, source=self)
+            os.close(fd)
+
     # ------------------------- Public API -------------------------
 
     def replay(self) -> Iterator[Tuple[str, str]]:
@@ -110,44 +163,41 @@ class AppendOnlyLog:
         -----
         - If the file ends without a newline, the last partial line is ignored.
         - Lines are split with maxsplit=2 to preserve spaces in the value.
+        - Records end at b"\\n" only; the file is memory-mapped (or, if that
+          fails, read in large chunks) and decoded in blocks, not line by line.
         """
-        if not os.path.exists(self.path):
+        try:
+            with open(self.path, "rb") as fh:
+                lineno = 0
+                halt = None
+                for block in self._line_blocks(fh.fileno()):
+                    # Decode a block of whole lines at once instead of line by line.
+                    try:
+                        text = block.decode(self.encoding)
+                    except UnicodeDecodeError as e:
+                        # Replay the whole lines before the bad byte, then stop.
+                        text = block[: block.rfind(b"\n", 0, e.start) + 1].decode(self.encoding)
+                        halt = e
+
+                    for line in text.split("\n")[:-1]:
+                        lineno += 1
+                        if not line:
+                            continue
+                        ok, key, value, reason = self._parse_and_validate(line)
+                        if not ok:
+                            msg = f"Skipping line {lineno}: {reason}"
+                            if self.strict:
+                                raise ValueError(msg)
+                            _logger.debug(msg)
+                            continue
+                        yield key, value
+
+                    if halt is not None:
+                        raise halt
+
+        except FileNotFoundError:
             _logger.debug("No log file at %s; nothing to replay.", self.path)
             return
-
-        try:
-            # Open in text mode; newline="" preserves universal newline handling
-            with open(self.path, "r", encoding=self.encoding, newline="") as fh:
-                # Peek last character to detect unterminated trailing line
-                try:
-                    fh.seek(0, io.SEEK_END)
-                    size = fh.tell()
-                    fh.seek(max(size - 1, 0), io.SEEK_SET)
-                    tail = fh.read(1) if size > 0 else "\n"
-                    if tail != "\n":
-                        _logger.warning(
-                            "Detected unterminated trailing line in %s; ignoring last partial line.",
-                            self.path,
-                        )
-                except Exception:
-                    # Non-fatal; continue without the check
-                    pass
-
-                fh.seek(0)
-                for lineno, raw in enumerate(fh, start=1):
-                    # If file had partial last line, it will appear here without '\n'.
-                    line = raw.rstrip("\n")
-                    if not line:
-                        continue
-                    ok, key, value, reason = self._parse_and_validate(line)
-                    if not ok:
-                        msg = f"Skipping line {lineno}: {reason}"
-                        if self.strict:
-                            raise ValueError(msg)
-                        _logger.debug(msg)
-                        continue
-                    yield key, value
-
         except UnicodeError as e:
             _logger.warning("Replay halted due to Unicode decode error: %s", e)
             return
@@ -156,23 +206,95 @@ class AppendOnlyLog:
             return
 
     def append_set(self, key: str, value: str) -> None:
-        """Append a single 'SET key value\\n' record and fsync.
+        """Append a single 'SET key value\\n' record with one durable write.
+
+        With group_commit=True the record is only queued; it becomes durable at
+        the next flush().
 
         Raises
         ------
         ValueError
-            If key/value fail basic validation.
+            If key/value fail basic validation or cannot be encoded, or the log
+            has been closed.
         OSError
-            If the write or fsync fails.
+            If the write or sync fails.
         """
+        self._check_open()
         self._validate_key_value_or_raise(key, value)
+        self._pending.append(self._encode_record(key, value))
+        if not self.group_commit:
+            self.flush()
 
-        line = f"SET {key} {value}\n"
-        # Text mode + flush + fsync is fine for single-process appenders.
-        with open(self.path, "a", encoding=self.encoding, newline="") as fh:
-            fh.write(line)
-            fh.flush()
-            os.fsync(fh.fileno())
+    def append_batch(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Append many 'SET key value\\n' records with one durable write.
+
+        Group commit: the sync cost is paid once for the whole batch instead of
+        once per record. Every pair is validated before anything is written, so
+        an invalid pair leaves the log untouched. Any records still queued by
+        append_set are written first, keeping append order.
+
+        Raises
+        ------
+        ValueError
+            If any key/value fails basic validation or cannot be encoded, or the
+            log has been closed.
+        OSError
+            If the write or sync fails.
+        """
+        self._check_open()
+        lines = []
+        for key, value in items:
+            self._validate_key_value_or_raise(key, value)
+            lines.append(self._encode_record(key, value))
+        self._pending.extend(lines)
+        self.flush()
+
+    def flush(self) -> None:
+        """Write all queued records with a single O_DSYNC write.
+
+        Without O_DSYNC the write is followed by one fdatasync (fsync where
+        fdatasync is unavailable).
+
+        The queue is taken before writing, so a failed write/sync is not
+        retried (the file state is unknown after a sync error); the OSError
+        propagates and those records must be treated as not durable.
+
+        Raises
+        ------
+        ValueError
+            If the log has been closed.
+        OSError
+            If the write or sync fails.
+        """
+        if not self._pending:
+            return
+        self._check_open()
+        if self._fd is None:
+            self._open_for_append()
+        data = b"".join(self._pending)
+        self._pending = []
+        # O_APPEND keeps single-process appends ordered; O_DSYNC makes the write durable.
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+        if not _O_DSYNC:
+            _sync(self._fd)
+
+    def close(self) -> None:
+        """Flush queued records and release the log file descriptor.
+
+        Safe to call more than once; the descriptor is released even if the
+        final flush fails (the OSError still propagates).
+        """
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            if self._fd is not None:
+                fd, self._fd = self._fd, None
+                os.close(fd)
 
     # Optional utility: rewrite a compacted file from an iterator of (k, v).
     def compact(self, items: Iterator[Tuple[str, str]], tmp_suffix: str = ".tmp") -> None:
@@ -187,18 +309,27 @@ class AppendOnlyLog:
         tmp_suffix : str
             Temporary file suffix for atomic rename.
         """
+        # Queued records go to the current file first so the replace below
+        # cannot silently drop them.
+        self.flush()
         tmp_path = self.path + tmp_suffix
         parent = os.path.dirname(self.path) or "."
 
-        with open(tmp_path, "w", encoding=self.encoding, newline="") as fh:
+        with open(tmp_path, "w", encoding=self.encoding, newline="", buffering=_COMPACT_BUFFER) as fh:
+            write = fh.write
             for k, v in items:
                 self._validate_key_value_or_raise(k, v)
-                fh.write(f"SET {k} {v}\n")
+                write(f"SET {k} {v}\n")
             fh.flush()
-            os.fsync(fh.fileno())
+            _sync(fh.fileno())
 
         # Atomic replace + directory fsync for durability of rename
         os.replace(tmp_path, self.path)
+        # The kept-open descriptor still points at the replaced file; drop it so
+        # the next flush() opens the new one.
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
         try:
             dir_fd = os.open(parent, os.O_RDONLY)
             try:
@@ -210,6 +341,75 @@ class AppendOnlyLog:
 
     # ----------------------- Internal helpers ----------------------
 
+    def _line_blocks(self, fd: int) -> Iterator[bytes]:
+        """Yield the log's complete lines in newline-terminated blocks of about
+        _REPLAY_BLOCK bytes; a partial last line is reported and dropped.
+
+        The file is memory-mapped; if it cannot be (e.g. not enough address
+        space for a huge log), it is read in _REPLAY_BLOCK-sized chunks instead.
+        """
+        if os.fstat(fd).st_size == 0:
+            return  # nothing to replay (and mmap cannot map an empty file)
+        try:
+            mm: Optional[mmap.mmap] = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            _logger.debug("Cannot mmap %s (%s); reading in chunks.", self.path, e)
+            mm = None
+
+        if mm is not None:
+            with mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)  # one front-to-back pass: read ahead
+                # O(1) tail check: everything after the last newline is partial.
+                end = mm.rfind(b"\n") + 1
+                partial = end < len(mm)
+                pos = 0
+                while pos < end:
+                    stop = (mm.rfind(b"\n", pos, pos + _REPLAY_BLOCK) + 1
+                            or mm.find(b"\n", pos) + 1)
+                    yield mm[pos:stop]
+                    pos = stop
+        else:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Pieces of the line spanning chunk boundaries; joined once its
+            # newline arrives, so a very long line is copied only once.
+            carry: List[bytes] = []
+            while True:
+                chunk = os.read(fd, _REPLAY_BLOCK)
+                if not chunk:
+                    break
+                cut = chunk.rfind(b"\n") + 1
+                if cut:
+                    carry.append(chunk[:cut])
+                    yield b"".join(carry)
+                    carry = [chunk[cut:]] if cut < len(chunk) else []
+                else:
+                    carry.append(chunk)
+            partial = bool(carry)
+
+        if partial:
+            _logger.warning(
+                "Detected unterminated trailing line in %s; ignoring last partial line.",
+                self.path,
+            )
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("I/O operation on closed log")
+
+    def _open_for_append(self) -> None:
+        self._fd = os.open(self.path, _APPEND_FLAGS, 0o644)
+        try:
+            # Best-effort: make the (possibly new) directory entry durable too
+            dir_fd = os.open(os.path.dirname(self.path) or ".", os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            _logger.debug("Directory fsync after opening the log skipped (not supported).")
+
     def _parse_and_validate(self, line: str) -> Tuple[bool, str, str, str]:
         parts = line.split(" ", 2)
         if len(parts) != 3:
@@ -217,7 +417,7 @@ class AppendOnlyLog:
         cmd, key, value = parts
         if cmd != "SET":
             return False, "", "", f"unsupported command '{cmd}'"
-        if not _KEY_RE.match(key):
+        if not _valid_key(key):
             return False, "", "", "invalid key (contains whitespace or empty)"
         if self.max_key_len is not None and len(key) > self.max_key_len:
             return False, "", "", f"key too long (> {self.max_key_len})"
@@ -225,8 +425,16 @@ class AppendOnlyLog:
             return False, "", "", f"value too long (> {self.max_value_len})"
         return True, key, value, ""
 
+    def _encode_record(self, key: str, value: str) -> bytes:
+        # Encoding at queue time keeps an unencodable record (e.g. a lone
+        # surrogate from surrogateescape'd input) out of _pending entirely.
+        try:
+            return f"SET {key} {value}\n".encode(self.encoding)
+        except UnicodeEncodeError as e:
+            raise ValueError(f"Key/value cannot be encoded as {self.encoding}: {e.reason}.") from None
+
     def _validate_key_value_or_raise(self, key: str, value: str) -> None:
-        if not _KEY_RE.match(key):
+        if not _valid_key(key):
             raise ValueError("Key must be non-empty and contain no whitespace.")
         if "\n" in value:
             raise ValueError("Value must not contain newline characters.")
@@ -0,0 +1,59 @@
+"""End-to-end tests for the CLI (run with: python -m unittest)."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def run_cli(stdin: bytes, db_path: str) -> subprocess.CompletedProcess:
+    """Pipe stdin into main.py (UTF-8 mode, as under a C/POSIX locale) and capture output."""
+    env = dict(os.environ, PYTHONUTF8="1")
+    return subprocess.run(
+        [sys.executable, MAIN, db_path],
+        input=stdin,
+        capture_output=True,
+        env=env,
+        timeout=30,
+    )
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self._tmp.name, "data.db")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_set_get_roundtrip(self) -> None:
+        r = run_cli(b"SET a 1\nGET a\nGET missing\nEXIT\n", self.db)
+        self.assertEqual(r.returncode, 0)
+        self.assertEqual(r.stdout, b"OK\n1\n\n")
+        with open(self.db, "rb") as fh:
+            self.assertEqual(fh.read(), b"SET a 1\n")
+
+    def test_non_utf8_value_is_rejected_without_losing_the_batch(self) -> None:
+        # \xff becomes a lone surrogate on decode; that record cannot be logged.
+        r = run_cli(b"SET a 1\nSET b x\xffy\nGET a\n", self.db)
+        self.assertEqual(r.returncode, 0)
+        self.assertEqual(r.stdout, b"OK\nERR internal\n1\n")
+        self.assertNotIn(b"Traceback", r.stderr)
+        with open(self.db, "rb") as fh:
+            self.assertEqual(fh.read(), b"SET a 1\n")
+
+        # The log keeps accepting writes, and they survive a restart.
+        r = run_cli(b"SET c 3\nGET a\nGET c\n", self.db)
+        self.assertEqual(r.stdout, b"OK\n1\n3\n")
+
+    def test_lines_end_at_lf_only(self) -> None:
+        # A lone CR is whitespace inside the line; CRLF endings are stripped.
+        r = run_cli(b"SET c x\ry\nSET a 1\rSET b 2\r\nGET c\r\nGET a\nGET b\n", self.db)
+        self.assertEqual(r.stdout, b"OK\nOK\nx y\n1 SET b 2\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()